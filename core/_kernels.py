@@ -0,0 +1,191 @@
+import numpy as np
+
+# Numba is optional: without it the kernels below run as plain Python (slow but correct)
+try:
+    from numba import njit, prange, config as numba_config
+    JIT_ENABLED = not numba_config.DISABLE_JIT
+except ImportError:
+    JIT_ENABLED = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Layout of the float64 state vector shared with SlotMachineController
+STATE_WAGERED = 0
+STATE_PROFIT = 1
+STATE_INTEGRAL = 2           # Slots 2..3 are the integrator state (i_state) consumed by _pid
+STATE_REACTIVE_INTEGRAL = 3
+STATE_PREV_ERROR = 4
+STATE_KI = 5
+STATE_KD = 6
+STATE_HOUSE_EDGE = 7
+STATE_SIZE = 8  # No kp slot: the P-term always uses P_GAIN
+
+# Fixed P-term gain used by calculate_step (PIDConfig.kp is not applied to the P-term)
+P_GAIN = 0.15
+
+
+@njit(cache=True)
+def _search_right(cdf, u):
+    """
+    Binary search equivalent to np.searchsorted(cdf, u, side='right'),
+    clamped to the last stop.
+    """
+    lo = 0
+    hi = cdf.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cdf[mid] <= u:
+            lo = mid + 1
+        else:
+            hi = mid
+    return min(lo, cdf.shape[0] - 1)
+
+
+@njit(cache=True)
+def _clip(v, lo, hi):
+    if v < lo:
+        return lo
+    if v > hi:
+        return hi
+    return v
+
+
+@njit(cache=True)
+def _pid(i_state, prev_error, error_percent, dt, kp, ki, kd):
+    """
+    One PID step. i_state = [integral, reactive_integral] is updated in place.
+    Returns the clamped signal u; the caller stores error_percent as the next prev_error.
+    """
+    # P-Term
+    p_out = kp * error_percent
+
+    # Dual-Path Memory Logic (Weighted Memory)
+    # 1. Base Integrator: 100% precision (No leak, keeps long-term target)
+    i_state[0] = _clip(i_state[0] + (error_percent * dt), -20.0, 20.0)
+
+    # 2. Reactive Integrator: Weight recent error 2x but decay old memory (0.99)
+    i_state[1] = _clip((i_state[1] * 0.99) + (error_percent * 2.0 * dt), -15.0, 15.0)
+
+    # Combined I-Term
+    i_out = ki * (i_state[0] + i_state[1])
+
+    # D-Term
+    d_out = kd * ((error_percent - prev_error) / dt)
+
+    # Total Signal u, clamped to [-0.9 (Tighten), 2.0 (Loosen)]
+    return _clip(p_out + i_out + d_out, -0.9, 2.0)
+
+
+@njit(cache=True)
+def spin_step(bet, base_w, direction, payouts, ids, state, weights, cdf, stops, draws):
+    """
+    One real-time spin (PID update -> weight update -> spin -> payout).
+    Mirrors SlotMachineController.calculate_step on plain arrays; weights follow
+    weight_new = weight_old * (1 + signal * direction), floored at 0.01.
+
+    base_w, direction, weights: (n_symbols,) arrays shared by every reel.
+        weights is written in place.
+    payouts, ids: per-stop lookup tables of the strip template.
+    state: float64 vector, see STATE_* layout. Updated in place.
+    cdf, stops: (n_symbols,) float64 / (n_reels,) int64 scratch buffers.
+    draws: (n_reels,) uniforms in [0, 1). All reels are sampled against the same CDF.
+    Returns (target, signal).
+    """
+    # 1. Update State & Get Signal (Pre-wager update)
+    state[STATE_WAGERED] += bet
+    state[STATE_PROFIT] += bet
+    wagered = state[STATE_WAGERED]
+
+    target = 0.0
+    signal = 0.0
+    if wagered != 0.0:
+        target = wagered * state[STATE_HOUSE_EDGE]
+        error_percent = ((state[STATE_PROFIT] - target) / wagered) * 100.0
+        signal = _pid(
+            state[STATE_INTEGRAL:STATE_REACTIVE_INTEGRAL + 1], state[STATE_PREV_ERROR],
+            error_percent, 1.0, P_GAIN, state[STATE_KI], state[STATE_KD]
+        )
+        state[STATE_PREV_ERROR] = error_percent
+
+    # 2. Adjust the shared weights once, then spin every reel against their CDF
+    total = 0.0
+    for j in range(base_w.shape[0]):
+        mult = max(0.01, 1.0 + signal * direction[j])
+        w = base_w[j] * mult
+        weights[j] = w
+        total += w
+        cdf[j] = total
+    n_reels = stops.shape[0]
+    for r in range(n_reels):
+        stops[r] = _search_right(cdf, draws[r] * total)
+
+    # 3. Payout on matching symbol ids (branchless: OR of XORs is 0 only if all ids match)
+    first_id = ids[stops[0]]
+    diff = 0
+    for r in range(1, n_reels):
+        diff |= ids[stops[r]] ^ first_id
+    matched = diff == 0
+    state[STATE_PROFIT] -= bet * payouts[stops[0]] * matched
+
+    return target, signal
+
+
+@njit(cache=True)
+def run_spins(n, bet, base_w, direction, payouts, ids, state, weights, draws):
+    """
+    Run n real-time spins through spin_step and record their history.
+
+    draws: (n, n_reels) uniforms in [0, 1), pre-drawn by the caller's Generator.
+    Other arguments as in spin_step.
+    Returns (profit, target, signal) history arrays of length n.
+    """
+    profit_hist = np.empty(n)
+    target_hist = np.empty(n)
+    signal_hist = np.empty(n)
+    cdf = np.empty(base_w.shape[0])
+    stops = np.empty(draws.shape[1], dtype=np.int64)
+
+    for k in range(n):
+        target, signal = spin_step(bet, base_w, direction, payouts, ids, state, weights, cdf, stops, draws[k])
+        profit_hist[k] = state[STATE_PROFIT]
+        target_hist[k] = target
+        signal_hist[k] = signal
+
+    return profit_hist, target_hist, signal_hist
+
+
+@njit(parallel=True, cache=True)
+def run_many(state_matrix, base_w, direction, payouts, ids, bets, n_reels, n_spins, out_profit, out_signal, out_weights, seeds):
+    """
+    Run n_spins on each of M independent machines in parallel (one machine per thread).
+
+    state_matrix: (M, STATE_SIZE) state vectors, updated in place.
+    bets: (M,) bet per machine.
+    out_profit, out_signal: (M, n_spins) history buffers.
+    out_weights: (M, n_symbols) reel weights per machine, updated in place.
+    seeds: (M,) uint32 seeds; machine m draws from its own (thread-local) RNG stream seeded with seeds[m].
+    """
+    for m in prange(state_matrix.shape[0]):
+        np.random.seed(seeds[m])
+        draws = np.random.random((n_spins, n_reels))
+        profit, _, signal = run_spins(n_spins, bets[m], base_w, direction, payouts, ids, state_matrix[m], out_weights[m], draws)
+        out_profit[m, :] = profit
+        out_signal[m, :] = signal
+
+
+if not JIT_ENABLED:
+    def run_many(state_matrix, base_w, direction, payouts, ids, bets, n_reels, n_spins, out_profit, out_signal, out_weights, seeds):
+        """
+        Plain-Python fallback for run_many (same arguments).
+        Machine m draws from its own Generator(PCG64(seeds[m])) rather than reseeding
+        the caller's global legacy RNG, so its stream differs from the compiled one.
+        """
+        for m in range(state_matrix.shape[0]):
+            draws = np.random.Generator(np.random.PCG64(int(seeds[m]))).random((n_spins, n_reels))
+            profit, _, signal = run_spins(n_spins, bets[m], base_w, direction, payouts, ids, state_matrix[m], out_weights[m], draws)
+            out_profit[m, :] = profit
+            out_signal[m, :] = signal
@@ -1,7 +1,13 @@
 import numpy as np
 import logging
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple, Union
+
+from core._kernels import (
+    _pid, spin_step, run_spins, run_many as run_many_kernel, P_GAIN,
+    STATE_SIZE, STATE_WAGERED, STATE_PROFIT, STATE_PREV_ERROR, STATE_INTEGRAL,
+    STATE_REACTIVE_INTEGRAL, STATE_KI, STATE_KD, STATE_HOUSE_EDGE,
+)
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s | %(levelname)s | %(name)s | %(message)s')
@@ -21,75 +27,28 @@ class PIDConfig:
     ki: float
     kd: float 
 
-class Reel:
-    def __init__(self, strip: List[Symbol], base_weights: List[float]):
-        """
-        Initialize a Reel.
-        strip: The physical list of symbols.
-        base_weights: The initial weight (Pi initialization).
-        """
-        self.strip = strip
-        self.base_weights = np.array(base_weights, dtype=np.float64)
-        self.current_weights = self.base_weights.copy()
-        
-    def adjust_weights(self, signal: float):
-        """
-        Adjust weights using Flowchart Logic.
-        Equation: weight_new = weight_old * (1 + modified)
-        
-        Modified Equation (Identified):
-        - Inputs: Signal (u), Payout (Vi)
-        - Logic: If Vi > 0 (Win), move with signal. If Vi = 0 (Loss), move against.
-        """
-        new_weights = self.base_weights.copy()
-        
-        for i, symbol in enumerate(self.strip):
-            # Identify Direction based on Vi (Payout)
-            # If Payout > 0: It increases Player Return -> Correlates with Loosen (+Sig)
-            # If Payout = 0: It decreases Player Return % -> Correlates with Tighten (-Sig)
-            
-            direction = 1.0 if symbol.payout_multiplier > 0 else -1.0
-            
-            # Modified term
-            modified = signal * direction
-            
-            # Equation: weight_new = weight_old * (1 + modified)
-            multiplier = 1.0 + modified
-            multiplier = max(0.01, multiplier) 
-            
-            new_weights[i] *= multiplier
-
-        self.current_weights = new_weights
-
-    def spin(self) -> Symbol:
-        """
-        Spin the reel using current weights.
-        """
-        total_weight = np.sum(self.current_weights)
-        if total_weight <= 0: return self.strip[0] 
-        
-        probs = self.current_weights / total_weight
-        stop_index = np.random.choice(len(self.strip), p=probs)
-        return self.strip[stop_index]
-
 class SlotMachineController:
-    def __init__(self, target_rtp: float, config: PIDConfig):
+    def __init__(self, target_rtp: float, config: PIDConfig, seed: Optional[int] = None):
         """
         Variables:
         - Target(n) derived from H (house_edge)
+        - seed: Optional seed for the machine's PCG64 random generator
         """
         self.target_rtp = target_rtp
         self.house_edge = 1.0 - target_rtp
         self.config = config
         
+        # Single persistent bit-generator for every spin of this machine
+        self.rng = np.random.Generator(np.random.PCG64(seed))
+        
         # State Tracking
         self.total_wagered = 0.0
         self.current_profit = 0.0
         
         # PID State
         self._prev_error = 0.0
-        self._integral = 0.0          # Long-term memory (Precision)
-        self._reactive_integral = 0.0 # Short-term weighted memory (Response)
+        # Integrators: [0] Long-term memory (Precision), [1] Short-term weighted memory (Response)
+        self._i_state = np.zeros(2, dtype=np.float64)
         
         # Initialize Symbols (Target-near payouts for Demo)
         self.sym_miss = Symbol("Miss", 0, 0.0)
@@ -104,13 +63,28 @@ class SlotMachineController:
             [self.sym_lemon] * 15 + # 75% Lemon
             [self.sym_bar] * 4      # 20% Bar
         )
-        base_weights = [10.0] * len(self.strip_template)
+        initial_weights = [10.0] * len(self.strip_template)
+        
+        # Per-stop lookup tables: the kernel only sees primitive arrays, never Symbol objects
+        self._payout_arr = np.array([s.payout_multiplier for s in self.strip_template], dtype=np.float64)
+        self._id_arr = np.array([s.id for s in self.strip_template], dtype=np.int32)
         
-        self.reels = [
-            Reel(self.strip_template, base_weights),
-            Reel(self.strip_template, base_weights),
-            Reel(self.strip_template, base_weights)
-        ]
+        # All reels share the same strip and base weights -> they always produce the same CDF,
+        # so the kernel adjusts the weights once per spin and samples that CDF n_reels times.
+        self.n_reels = 3
+        
+        # Shared reel weights (Pi initialization), owned here rather than per reel
+        self.base_weights = np.array(initial_weights, dtype=np.float32)
+        self.current_weights = self.base_weights.copy()
+        
+        # Direction per symbol based on Vi (Payout), a property of the strip: built once here
+        # If Payout > 0: It increases Player Return -> Correlates with Loosen (+Sig)
+        # If Payout = 0: It decreases Player Return % -> Correlates with Tighten (-Sig)
+        self.direction = np.where(self._payout_arr > 0, 1.0, -1.0).astype(np.float32)
+        
+        # Scratch buffers for the single-spin fast path
+        self._cdf = np.empty(len(self.strip_template), dtype=np.float64)
+        self._stops = np.empty(self.n_reels, dtype=np.int64)
 
     def calculate_step(self, payout: float, wager: float):
         """
@@ -138,80 +112,111 @@ class SlotMachineController:
         # e(n) = (Pn - Target(n)) / Tn * 100
         error_percent = ((self.current_profit - target_profit) / self.total_wagered) * 100.0
         
-        # PID Logic (Faster response for demo)
+        # PID Logic (Faster response for demo), compiled in core._kernels._pid
         dt = 1.0 
-        
-        # P-Term
-        p_out = 0.15 * error_percent
-        
-        # Dual-Path Memory Logic (Weighted Memory)
-        # 1. Base Integrator: 100% precision (No leak, keeps long-term target)
-        self._integral += (error_percent * dt)
-        self._integral = max(-20.0, min(20.0, self._integral))
-        
-        # 2. Reactive Integrator: Focused on recent "Emotional" response
-        # Weight recent error 2x but decay old memory (0.99)
-        self._reactive_integral = (self._reactive_integral * 0.99) + (error_percent * 2.0 * dt)
-        self._reactive_integral = max(-15.0, min(15.0, self._reactive_integral))
-        
-        # Combined I-Term
-        i_out = self.config.ki * (self._integral + self._reactive_integral)
-        
-        # D-Term
-        derivative = (error_percent - self._prev_error) / dt
-        d_out = self.config.kd * derivative
-        
+        u_clamped = _pid(self._i_state, self._prev_error, error_percent, dt, P_GAIN, self.config.ki, self.config.kd)
         self._prev_error = error_percent
-        
-        # Total Signal u
-        u = p_out + i_out + d_out
-        
-        # Widened Clamping for Demo (Allow more aggressive loosening)
-        # Upper: 2.0 (Loosen), Lower: -0.9 (Tighten)
-        if u > 2.0:
-            u_clamped = 2.0
-        elif u < -0.9:
-            u_clamped = -0.9
-        else:
-            u_clamped = u
             
         return self.current_profit, target_profit, u_clamped
 
 
 
-    def spin_batch(self, batch_size: int, bet_amount: float = 1.0) -> Tuple[float, float, float, float]:
-        bet_size = bet_amount
-        batch_wagered = batch_size * bet_size
-        batch_payout = 0.0
-        
-        # We need to execute the loop one by one to simulate real-time PID
-        last_signal = 0.0
-        last_target = 0.0
-        
-        for _ in range(batch_size):
-            # 1. Update State & Get Signal (Based on previous result)
-            curr, last_target, last_signal = self.calculate_step(0, bet_size) # Pre-wager update
-            
-            # 2. Adjust Reels
-            for reel in self.reels:
-                reel.adjust_weights(last_signal)
-            
-            # 3. Spin
-            r1 = self.reels[0].spin()
-            r2 = self.reels[1].spin()
-            r3 = self.reels[2].spin()
-            
-            spin_payout = 0.0
-            if r1.id == r2.id == r3.id:
-                spin_payout = bet_size * r1.payout_multiplier
-            
-            # Update profit with payout
-            self.current_profit -= spin_payout # Payout reduces profit
-            batch_payout += spin_payout
-            
-    
-        return self.current_profit, last_target, last_signal, self.reels[0].current_weights[0]
+    def _pack_state(self) -> np.ndarray:
+        """
+        Pack controller + PID state into the kernel state vector (see core._kernels).
+        """
+        state = np.empty(STATE_SIZE, dtype=np.float64)
+        state[STATE_WAGERED] = self.total_wagered
+        state[STATE_PROFIT] = self.current_profit
+        state[STATE_PREV_ERROR] = self._prev_error
+        state[STATE_INTEGRAL:STATE_REACTIVE_INTEGRAL + 1] = self._i_state
+        state[STATE_KI] = self.config.ki
+        state[STATE_KD] = self.config.kd
+        state[STATE_HOUSE_EDGE] = self.house_edge
+        return state
+
+    def _unpack_state(self, state: np.ndarray):
+        self.total_wagered = float(state[STATE_WAGERED])
+        self.current_profit = float(state[STATE_PROFIT])
+        self._prev_error = float(state[STATE_PREV_ERROR])
+        self._i_state[:] = state[STATE_INTEGRAL:STATE_REACTIVE_INTEGRAL + 1]
+
+    def spin_once(self, bet: float) -> Tuple[float, float, float, float]:
+        """
+        Fast path for a single real-time spin; equivalent to spin_batch(1, bet).
+        Returns (current_profit, target, signal, weight of stop 0).
+        """
+        state = self._pack_state()
+        target, signal = spin_step(
+            float(bet), self.base_weights, self.direction, self._payout_arr, self._id_arr,
+            state, self.current_weights, self._cdf, self._stops, self.rng.random(self.n_reels)
+        )
+        self._unpack_state(state)
         
+        return self.current_profit, target, signal, self.current_weights[0]
 
+    def spin_batch(self, batch_size: int, bet_amount: float = 1.0) -> Tuple[float, float, float, float]:
+        """
+        Execute spins one by one (real-time PID) inside the compiled kernel.
+        Returns (current_profit, last_target, last_signal, weight of stop 0).
+        """
+        if batch_size <= 0:
+            return self.current_profit, 0.0, 0.0, self.current_weights[0]
+        
+        state = self._pack_state()
+        draws = self.rng.random((batch_size, self.n_reels))
+        _, targets, signals = run_spins(
+            batch_size, float(bet_amount),
+            self.base_weights, self.direction, self._payout_arr, self._id_arr,
+            state, self.current_weights, draws
+        )
+        self._unpack_state(state)
+        
+        return self.current_profit, float(targets[-1]), float(signals[-1]), self.current_weights[0]
 
 
+def run_many(machines: List[SlotMachineController], n_spins: int,
+             bet_amount: Union[float, Sequence[float]] = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate several independent machines in parallel (Monte Carlo sweeps / soak tests).
+    All machines must share the same strip template; PID config and target RTP may differ.
+    bet_amount: a single bet for every machine or one bet per machine.
+    Each machine's stream is seeded from its own persistent rng, so repeated calls draw
+    fresh uniforms and SlotMachineController(seed=...) makes a sweep reproducible.
+    Returns (profit_history, signal_history), each shaped (len(machines), n_spins).
+    """
+    if not machines:
+        raise ValueError("run_many requires at least one machine")
+    if n_spins < 0:
+        raise ValueError("run_many requires n_spins >= 0")
+    
+    template = machines[0]
+    for machine in machines[1:]:
+        if (machine.n_reels != template.n_reels
+                or not np.array_equal(machine.base_weights, template.base_weights)
+                or not np.array_equal(machine._payout_arr, template._payout_arr)
+                or not np.array_equal(machine._id_arr, template._id_arr)):
+            raise ValueError("run_many requires machines with identical reel layouts")
+    
+    n_machines = len(machines)
+    if n_spins == 0:
+        return np.empty((n_machines, 0)), np.empty((n_machines, 0))
+    
+    state_matrix = np.stack([machine._pack_state() for machine in machines])
+    bets = np.broadcast_to(np.asarray(bet_amount, dtype=np.float64), (n_machines,)).copy()
+    out_profit = np.empty((n_machines, n_spins))
+    out_signal = np.empty((n_machines, n_spins))
+    out_weights = np.stack([machine.current_weights for machine in machines])
+    # Legacy MT19937 seeding (used by the compiled kernel) accepts 32-bit seeds only
+    seeds = np.array([machine.rng.integers(2**32, dtype=np.uint32) for machine in machines])
+    
+    run_many_kernel(
+        state_matrix, template.base_weights, template.direction, template._payout_arr, template._id_arr,
+        bets, template.n_reels, n_spins, out_profit, out_signal, out_weights, seeds
+    )
+    
+    for machine, state, weights in zip(machines, state_matrix, out_weights):
+        machine._unpack_state(state)
+        machine.current_weights[:] = weights
+    
+    return out_profit, out_signal
@@ -2,7 +2,6 @@ import numpy as np
 import time
 import sys
 import os
-import random
 try:
     import matplotlib.pyplot as plt
 except ImportError:
@@ -111,10 +110,12 @@ def test_black_swan():
     recovery_spin = 0
     limit_spins = max_spins
     
-    # Data for Graphing
-    history_x = [0] # Spin Count for X-axis
-    history_profit = [machine.current_profit]
-    history_target = [machine.total_wagered * machine.house_edge]
+    # Data for Graphing (preallocated float32, slot 0 holds the initial state)
+    history_x = np.arange(max_spins + 1) # Spin Count for X-axis
+    history_profit = np.empty(max_spins + 1, dtype=np.float32)
+    history_profit[0] = machine.current_profit
+    history_target = np.empty(max_spins + 1, dtype=np.float32)
+    history_target[0] = machine.total_wagered * machine.house_edge
     
     # Calculate initial RTP (avoid div by zero)
     init_rtp = 0.0
@@ -122,11 +123,18 @@ def test_black_swan():
         init_payout = machine.total_wagered - machine.current_profit
         init_rtp = (init_payout / machine.total_wagered) * 100.0
     
-    history_rtp_actual = [init_rtp]
-    history_signal = [0.0]
+    history_rtp_actual = np.empty(max_spins + 1, dtype=np.float32)
+    history_rtp_actual[0] = init_rtp
+    history_signal = np.empty(max_spins + 1, dtype=np.float32)
+    history_signal[0] = 0.0
     chaos_history = []  # Track bets for distribution analysis
     event_indices = []  # Track when a "Black Swan" event happens
     
+    # CHAOS LOGIC: Pre-draw every random bet size in one vectorized call
+    if sim_mode == 3:
+        chaos_bets = machine.rng.uniform(chaos_min, chaos_max, size=max_spins)
+        chaos_history = chaos_bets
+    
     print("🔄 Running Simulation...", end="", flush=True)
     
     for i in range(max_spins):
@@ -147,20 +155,18 @@ def test_black_swan():
         # CHAOS LOGIC: Randomize bet size per spin
         current_bet = bet_size
         if sim_mode == 3:
-            current_bet = random.uniform(chaos_min, chaos_max)
-            chaos_history.append(current_bet)
+            current_bet = chaos_bets[i]
             
-        curr, target, sig, _ = machine.spin_batch(1, bet_amount=current_bet) # Real-time batch
+        curr, target, sig, _ = machine.spin_once(current_bet) # Real-time single spin
         
         # Collect Data (Every single spin per user request)
-        history_x.append(i + 1)
-        history_profit.append(curr)
-        history_target.append(target)
+        history_profit[i + 1] = curr
+        history_target[i + 1] = target
         
         payout = machine.total_wagered - curr
         actual_rtp = (payout / machine.total_wagered) * 100.0 if machine.total_wagered > 0 else 0.0
-        history_rtp_actual.append(actual_rtp)
-        history_signal.append(sig)
+        history_rtp_actual[i + 1] = actual_rtp
+        history_signal[i + 1] = sig
 
         # Feedback animation
         if i % 100 == 0:
@@ -183,6 +189,14 @@ def test_black_swan():
                 break
             
     print("\n" + "-" * 60)
+    
+    # Trim histories to the spins actually run (Auto-Recovery may stop early)
+    total_spins_run = i + 1
+    history_x = history_x[:total_spins_run + 1]
+    history_profit = history_profit[:total_spins_run + 1]
+    history_target = history_target[:total_spins_run + 1]
+    history_rtp_actual = history_rtp_actual[:total_spins_run + 1]
+    history_signal = history_signal[:total_spins_run + 1]
             
     # 4. Analyze Results
     is_recovery_test = (win_multiplier > 0 and hit_interval == 0)
@@ -193,7 +207,7 @@ def test_black_swan():
         else:
             print(f"\033[1;31m❌ FAILED to recover in {max_spins} spins.\033[0m")
     else:
-        print(f"\033[1;32m✅ SIMULATION COMPLETE ({i+1} spins)\033[0m")
+        print(f"\033[1;32m✅ SIMULATION COMPLETE ({total_spins_run} spins)\033[0m")
         
     print(f"Final Profit: {curr:.2f} (Target: {target:.2f})")
     print(f"Peak PID Signal: {min(history_signal):.4f} (Max Tightening)") # Min because tightening is negative
@@ -223,7 +237,7 @@ def test_black_swan():
     print(f"🔄 Total Turnover:         ${machine.total_wagered:.2f}")
     
     # 4.6. Chaos Mode Distribution (Requested by user)
-    if sim_mode == 3 and chaos_history:
+    if sim_mode == 3 and len(chaos_history) > 0:
         print("-" * 60)
         print("🎲 CHAOS BET DISTRIBUTION (10 Bins)")
         print("-" * 60)
@@ -255,19 +269,21 @@ def test_black_swan():
         ax1.plot(history_x, history_profit, 'g-', label='Actual Profit (Real)', linewidth=1.5)
         
         # Markers for Black Swan Events
-        if show_markers:
-            for idx in event_indices:
-                label = "Black Swan" if idx == event_indices[0] else ""
-                ax1.axvline(x=idx, color='orange', linestyle=':', alpha=0.8, linewidth=1.5, label=label)
-                # Add a small text box or arrow
-                ax1.annotate('💥 EVENT', xy=(idx, history_profit[idx] if idx < len(history_profit) else history_profit[-1]), 
-                             xytext=(10, 20), textcoords='offset points',
-                             arrowprops=dict(arrowstyle='->', color='orange'),
-                             fontsize=8, color='orange', fontweight='bold',
-                             bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="orange", alpha=0.8))
+        if show_markers and event_indices:
+            # One line collection for all events (y in axes fraction, like axvline)
+            ax1.vlines(event_indices, ymin=0, ymax=1, transform=ax1.get_xaxis_transform(),
+                       colors='orange', linestyles=':', alpha=0.8, linewidth=1.5, label='Black Swan')
+            # Annotate the first event only
+            idx = event_indices[0]
+            ax1.annotate('💥 EVENT', xy=(idx, history_profit[idx] if idx < len(history_profit) else history_profit[-1]), 
+                         xytext=(10, 20), textcoords='offset points',
+                         arrowprops=dict(arrowstyle='->', color='orange'),
+                         fontsize=8, color='orange', fontweight='bold',
+                         bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="orange", alpha=0.8))
 
-        ax1.fill_between(history_x, history_profit, history_target, where=[a < b for a,b in zip(history_profit, history_target)], color='red', alpha=0.1, label='Loss Area')
-        ax1.fill_between(history_x, history_profit, history_target, where=[a >= b for a,b in zip(history_profit, history_target)], color='green', alpha=0.1, label='Profit Area')
+        loss_mask = history_profit < history_target
+        ax1.fill_between(history_x, history_profit, history_target, where=loss_mask, color='red', alpha=0.1, label='Loss Area')
+        ax1.fill_between(history_x, history_profit, history_target, where=~loss_mask, color='green', alpha=0.1, label='Profit Area')
         ax1.set_ylabel("Profit ($)")
         ax1.legend(loc='upper left', fontsize=9)
         ax1.grid(True, alpha=0.3)
@@ -309,7 +325,6 @@ def test_black_swan():
         # Use \$ to escape dollar signs for Matplotlib, preventing accidental math-mode font changes
         bet_info = f"Chaos Range: \${chaos_min} - \${chaos_max}" if sim_mode == 3 else f"Fixed Bet: \${bet_size}"
         
-        total_spins_run = len(history_x) - 1
         header_title = f"OpenRTP Engine: {active_mode_name}\n{event_info} | {bet_info}\nTotal Spins: {total_spins_run:,} | {status_text}"
         
         fig.suptitle(header_title, fontsize=14, fontweight='bold', y=0.98)